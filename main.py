@@ -7,6 +7,166 @@ import numpy as np
 from itertools import permutations
 import json
 import time
+import threading
+import functools
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+try:
+    from scipy import sparse
+    SCIPY_DISPONIBLE = True
+except ImportError:
+    SCIPY_DISPONIBLE = False
+
+# Pasos totales del backtracking antes de repartir los inicios entre procesos
+PASOS_PASADA_RAPIDA = 200_000
+PROCESOS_BUSQUEDA = os.cpu_count() or 1
+
+# Máximo de componentes para calcular el diámetro exacto
+LIMITE_DIAMETRO_EXACTO = 50
+
+# Número de disposiciones de spring_layout que conserva el visualizador
+TAMANO_CACHE_LAYOUT = 4
+
+# Tipos de componente predefinidos y su codificación entera
+TIPOS_COMPONENTE = ("Resistor", "Capacitor", "Inductor", "Transistor", "IC", "Fuente")
+TYPE_TO_INT = {tipo: i for i, tipo in enumerate(TIPOS_COMPONENTE)}
+
+COLORES_COMPONENTES = {
+    'Resistor': 'lightblue',
+    'Capacitor': 'lightgreen', 
+    'Inductor': 'lightyellow',
+    'Transistor': 'lightcoral',
+    'IC': 'lightpink',
+    'Fuente': 'gold'
+}
+
+def _dp_hamiltoniano(adj_mask, n, inicio):
+    """DP iterativa sobre subconjuntos; devuelve el camino como índices (vacío si no existe).
+    
+    Con inicio >= 0 busca un ciclo: el camino parte de ese nodo y su último
+    nodo debe estar conectado con él.
+    """
+    completo = (1 << n) - 1
+    # dp[mask, v]: existe un camino que visita mask y termina en v
+    dp = np.zeros((1 << n, n), dtype=np.uint8)
+    parent = np.full_like(dp, 255)
+    for v in range(n):
+        if inicio < 0 or v == inicio:
+            dp[1 << v, v] = 1
+        
+    # Cada superconjunto es numéricamente mayor que sus subconjuntos,
+    # así que recorrer las máscaras en orden creciente basta
+    for mask in range(1, completo + 1):
+        for u in range(n):
+            if dp[mask, u] == 0:
+                continue
+            for v in range(n):
+                if (mask >> v) & 1 == 0 and (adj_mask[u] >> v) & 1:
+                    siguiente = mask | (1 << v)
+                    if dp[siguiente, v] == 0:
+                        dp[siguiente, v] = 1
+                        parent[siguiente, v] = u
+                        
+    # Reconstruir el camino siguiendo los punteros al padre
+    for final in range(n):
+        if dp[completo, final] and (inicio < 0 or (adj_mask[final] >> inicio) & 1):
+            camino = np.empty(n, dtype=np.int64)
+            mask = completo
+            v = final
+            for k in range(n - 1, -1, -1):
+                camino[k] = v
+                previo = parent[mask, v]
+                mask ^= 1 << v
+                v = previo
+            return camino
+    return np.empty(0, dtype=np.int64)
+
+if NUMBA_DISPONIBLE:
+    # En el ejecutable empaquetado no hay fuente junto a la que guardar la
+    # caché de Numba; cualquier fallo de compilación deja la versión en Python
+    try:
+        _dp_hamiltoniano = njit("int64[:](int64[::1], int64, int64)",
+                                cache=not getattr(sys, "frozen", False),
+                                boundscheck=False)(_dp_hamiltoniano)
+    except Exception:
+        NUMBA_DISPONIBLE = False
+
+# Máximo de componentes para la búsqueda por DP con máscaras de bits (memoria O(n·2ⁿ))
+LIMITE_DP = 20 if NUMBA_DISPONIBLE else 16
+
+def _bits(m):
+    """Índices de los bits activos de m, de menor a mayor"""
+    while m:
+        b = m & -m
+        yield b.bit_length() - 1
+        m ^= b
+        
+def _buscar_desde(tarea):
+    """Backtracking iterativo desde un nodo inicial.
+    
+    tarea = (adj_int, n, inicio, ciclo, limite_pasos). Devuelve el camino como
+    lista de índices, None si no existe desde ese inicio, o False si se agotó
+    limite_pasos sin terminar. Está a nivel de módulo para poder enviarse a
+    los procesos de un Pool.
+    """
+    adj_int, n, inicio, ciclo, limite_pasos = tarea
+    # Buffers de longitud n reservados una sola vez: path_buf[:depth] es el
+    # camino actual e it_stack[depth - 1] itera los vecinos libres de su
+    # último nodo; avanzar o retroceder solo mueve depth y la máscara
+    path_buf = [0] * n
+    it_stack = [None] * n
+    
+    # Regla de Warnsdorff: rem_deg[v] cuenta los vecinos aún libres de v y
+    # los vecinos se prueban de menor a mayor rem_deg
+    rem_deg = [bin(m).count("1") for m in adj_int]
+    
+    def visitar(v, delta):
+        for u in _bits(adj_int[v]):
+            rem_deg[u] += delta
+            
+    def vecinos_libres(v):
+        return iter(sorted(_bits(adj_int[v] & ~mask), key=rem_deg.__getitem__))
+        
+    path_buf[0] = inicio
+    mask = 1 << inicio
+    visitar(inicio, -1)
+    it_stack[0] = vecinos_libres(inicio)
+    depth = 1
+    pasos = 0
+    while depth:
+        vecino = next(it_stack[depth - 1], None)
+        if vecino is None:
+            depth -= 1
+            mask ^= 1 << path_buf[depth]
+            visitar(path_buf[depth], 1)
+            continue
+            
+        pasos += 1
+        if limite_pasos is not None and pasos > limite_pasos:
+            return False
+            
+        if depth + 1 == n:
+            # Un ciclo además debe poder volver al nodo inicial
+            if not ciclo or adj_int[vecino] & (1 << inicio):
+                path_buf[depth] = vecino
+                return path_buf
+            continue
+            
+        path_buf[depth] = vecino
+        mask |= 1 << vecino
+        visitar(vecino, -1)
+        it_stack[depth] = vecinos_libres(vecino)
+        depth += 1
+    return None
 
 class CircuitoElectronico:
     """Clase para representar un circuito electrónico como grafo"""
@@ -14,30 +174,210 @@ class CircuitoElectronico:
     def __init__(self, nombre="Circuito"):
         self.nombre = nombre    
         self.grafo = nx.Graph()
-        self.componentes = {}  # {nodo: tipo_componente}
-        self.conexiones = {}   # {arista: resistencia/impedancia}
+        self.conexiones = {}   # {(min, max): resistencia/impedancia}
+        
+        # Componentes como arreglos paralelos (mismo orden que grafo.nodes()):
+        # id de cada nodo y código de su tipo en self.tipos (-1 = sin tipo)
+        self._indices = {}     # {nodo: posición en los arreglos y en la matriz}
+        self._node_ids = []
+        self._type_idx = np.full(8, -1, dtype=np.int32)
+        self.tipos = list(TIPOS_COMPONENTE)
+        
+        # Matriz de adyacencia en formato COO, acumulada al insertar aristas
+        self._filas = []
+        self._columnas = []
+        self._matriz_adyacencia = None
+        self._adj_dirty = True
+        
+        # Estadísticas del grafo, recalculadas solo tras una modificación
+        self._stats = None
+        self._stats_dirty = True
+        
+    def _indice(self, nodo):
+        """Índice del nodo en los arreglos de componentes (mismo orden que grafo.nodes())"""
+        if nodo not in self._indices:
+            i = len(self._node_ids)
+            if i == len(self._type_idx):
+                # Crecimiento geométrico para que agregar sea O(1) amortizado
+                self._type_idx = np.concatenate([self._type_idx, np.full_like(self._type_idx, -1)])
+            self._indices[nodo] = i
+            self._node_ids.append(nodo)
+        return self._indices[nodo]
+        
+    @property
+    def node_ids(self):
+        """Ids de los nodos, alineados con type_idx"""
+        return self._node_ids
+        
+    @property
+    def type_idx(self):
+        """Código del tipo de cada nodo como arreglo int32 (-1 si no es un componente)"""
+        return self._type_idx[:len(self._node_ids)]
+        
+    def tiene_componente(self, id_componente):
+        """Verificar si el componente fue agregado al circuito"""
+        i = self._indices.get(id_componente)
+        return i is not None and self._type_idx[i] >= 0
+        
+    def tipo_componente(self, id_componente):
+        """Tipo del componente, o None si no existe"""
+        if not self.tiene_componente(id_componente):
+            return None
+        return self.tipos[self._type_idx[self._indices[id_componente]]]
         
     def agregar_componente(self, id_componente, tipo, posicion=None):
         """Agregar un componente al circuito"""
+        codigo = TYPE_TO_INT.get(tipo)
+        if codigo is None:
+            # Tipos escritos a mano: se registran solo en este circuito
+            if tipo not in self.tipos:
+                self.tipos.append(tipo)
+            codigo = self.tipos.index(tipo)
+            
         self.grafo.add_node(id_componente)
-        self.componentes[id_componente] = tipo
+        i = self._indice(id_componente)
+        self._adj_dirty = True
+        self._stats_dirty = True
+        self._type_idx[i] = codigo
         if posicion:
             self.grafo.nodes[id_componente]['pos'] = posicion
             
     def agregar_conexion(self, comp1, comp2, resistencia=1.0):
         """Agregar conexión entre componentes"""
+        if not self.grafo.has_edge(comp1, comp2):
+            i, j = self._indice(comp1), self._indice(comp2)
+            self._filas.append(i)
+            self._columnas.append(j)
+            if i != j:
+                self._filas.append(j)
+                self._columnas.append(i)
+            self._adj_dirty = True
         self.grafo.add_edge(comp1, comp2)
-        self.conexiones[(comp1, comp2)] = resistencia
+        self._stats_dirty = True
+        # Clave canónica: una sola entrada por conexión, sin importar el sentido
+        self.conexiones[tuple(sorted((comp1, comp2)))] = resistencia
         
     def obtener_matriz_adyacencia(self):
         """Obtener matriz de adyacencia del circuito"""
-        return nx.adjacency_matrix(self.grafo).todense()
+        if self._adj_dirty:
+            n = len(self._indices)
+            filas = np.array(self._filas, dtype=np.int32)
+            columnas = np.array(self._columnas, dtype=np.int32)
+            if SCIPY_DISPONIBLE:
+                datos = np.ones(len(filas), dtype=np.int64)
+                self._matriz_adyacencia = sparse.coo_matrix(
+                    (datos, (filas, columnas)), shape=(n, n)).toarray()
+            else:
+                self._matriz_adyacencia = np.zeros((n, n), dtype=np.int64)
+                self._matriz_adyacencia[filas, columnas] = 1
+            self._adj_dirty = False
+        # Copia: quien modifique el resultado no debe alterar la caché
+        return self._matriz_adyacencia.copy()
+        
+    def obtener_estadisticas(self):
+        """Obtener densidad, grados y conectividad del circuito (memorizadas)"""
+        if self._stats_dirty:
+            grados = dict(self.grafo.degree())
+            self._stats = {
+                'densidad': nx.density(self.grafo),
+                'grados': grados,
+                'grado_promedio': sum(grados.values()) / len(grados) if grados else 0.0,
+                'conectado': nx.is_connected(self.grafo) if grados else None,
+            }
+            self._stats_dirty = False
+        # Copia: quien modifique el resultado no debe alterar la caché
+        estadisticas = dict(self._stats)
+        estadisticas['grados'] = dict(self._stats['grados'])
+        return estadisticas
 
 class AnalizadorHamiltoniano:
     """Clase para análisis de caminos hamiltonianos en circuitos"""
     
     def __init__(self, circuito):
         self.circuito = circuito
+        self._huella_actual = None
+        self._cached_path = None  # (huella, camino)
+        self._cached_cycle = None  # (huella, ciclo)
+        self._cached_resistencia = None  # (camino, resistencia_total)
+        self._sincronizar()
+        
+    def _fingerprint(self):
+        """Huella del circuito: cambia al agregar componentes o conexiones"""
+        grafo = self.circuito.grafo
+        return (frozenset(grafo.nodes()), frozenset(grafo.edges()),
+                frozenset(self.circuito.conexiones.items()))
+        
+    def huella(self):
+        """Huella del circuito analizado, tras sincronizar las estructuras internas"""
+        return self._sincronizar()
+        
+    def _sincronizar(self):
+        """Reconstruir las estructuras internas si el circuito cambió"""
+        huella = self._fingerprint()
+        if huella != self._huella_actual:
+            self._huella_actual = huella
+            self._cached_resistencia = None
+            self._construir_adyacencia()
+        return huella
+        
+    def _construir_adyacencia(self):
+        """Construir la adyacencia del circuito en formato CSR con índices enteros"""
+        grafo = self.circuito.grafo
+        self._nodos = list(grafo.nodes())
+        self._idx = {nodo: i for i, nodo in enumerate(self._nodos)}
+        n = len(self._nodos)
+        
+        # Grado de cada nodo -> desplazamientos de cada lista de vecinos
+        aristas = np.array([(self._idx[u], self._idx[v]) for u, v in grafo.edges()],
+                           dtype=np.int32).reshape(-1, 2)
+        grados = np.bincount(aristas.ravel(), minlength=n)
+        self._offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(grados, out=self._offsets[1:])
+        
+        # Una sola pasada sobre las aristas rellenando ambos sentidos
+        self._vecinos = np.empty(self._offsets[-1], dtype=np.int32)
+        siguiente = self._offsets[:-1].tolist()
+        for u, v in aristas.tolist():
+            self._vecinos[siguiente[u]] = v
+            siguiente[u] += 1
+            self._vecinos[siguiente[v]] = u
+            siguiente[v] += 1
+            
+        self._conectado = self._es_conectado()
+        self._construir_resistencias()
+        
+    def _es_conectado(self):
+        """BFS sobre la adyacencia CSR: todos los nodos alcanzables desde el 0"""
+        n = len(self._nodos)
+        if n == 0:
+            return False
+        vecinos = self._vecinos.tolist()
+        offsets = self._offsets.tolist()
+        visitados = [False] * n
+        visitados[0] = True
+        pendientes = [0]
+        alcanzados = 1
+        while pendientes:
+            v = pendientes.pop()
+            for u in vecinos[offsets[v]:offsets[v + 1]]:
+                if not visitados[u]:
+                    visitados[u] = True
+                    alcanzados += 1
+                    pendientes.append(u)
+        return alcanzados == n
+        
+    def _construir_resistencias(self):
+        """Construir la matriz densa de resistencias entre componentes"""
+        n = len(self._nodos)
+        self.matriz_resistencias = np.ones((n, n), dtype=np.float64)  # Resistencia por defecto
+        if not self.circuito.conexiones:
+            return
+            
+        filas = np.fromiter((self._idx[a] for a, _ in self.circuito.conexiones), dtype=np.intp)
+        columnas = np.fromiter((self._idx[b] for _, b in self.circuito.conexiones), dtype=np.intp)
+        valores = np.fromiter(self.circuito.conexiones.values(), dtype=np.float64)
+        self.matriz_resistencias[filas, columnas] = valores
+        self.matriz_resistencias[columnas, filas] = valores
         
     def es_hamiltoniano(self):
         """Verificar si existe un camino hamiltoniano"""
@@ -48,60 +388,207 @@ class AnalizadorHamiltoniano:
             return False
             
     def encontrar_camino_hamiltoniano(self):
-        """Encontrar camino hamiltoniano usando backtracking"""
-        nodos = list(self.circuito.grafo.nodes())
+        """Encontrar camino hamiltoniano, reutilizando el último resultado si el circuito no cambió"""
+        huella = self._sincronizar()
+        if self._cached_path is None or self._cached_path[0] != huella:
+            self._cached_path = (huella, self._buscar_hamiltoniano(ciclo=False))
+            
+        camino = self._cached_path[1]
+        return list(camino) if camino is not None else None
+        
+    def _buscar_hamiltoniano(self, ciclo):
+        """Buscar camino (o ciclo) hamiltoniano usando programación dinámica sobre subconjuntos"""
+        nodos = self._nodos
         if len(nodos) < 2:
-            return nodos
+            return list(nodos)
             
-        def backtrack(camino, visitados):
-            if len(camino) == len(nodos):
+        # Condiciones necesarias: circuito conectado y sin componentes aislados
+        grados = np.diff(self._offsets)
+        if grados.min() < 1 or not self._conectado:
+            return None
+            
+        # Condición de Dirac (grado mínimo >= n/2): el camino existe y un
+        # recorrido voraz casi siempre lo encuentra sin búsqueda exponencial
+        if grados.min() >= len(nodos) / 2:
+            camino = self._camino_voraz()
+            if camino is not None and (not ciclo or self.circuito.grafo.has_edge(camino[-1], camino[0])):
                 return camino
                 
-            ultimo_nodo = camino[-1]
-            for vecino in self.circuito.grafo.neighbors(ultimo_nodo):
-                if vecino not in visitados:
-                    nuevo_camino = camino + [vecino]
-                    nuevos_visitados = visitados | {vecino}
-                    resultado = backtrack(nuevo_camino, nuevos_visitados)
-                    if resultado:
-                        return resultado
+        # Un nodo de grado 1 solo puede ser extremo del camino: con más de dos
+        # no hay camino, y si los hay basta con buscar desde ellos
+        if (grados == 1).sum() > 2:
             return None
+        extremos = self._extremos_candidatos(grados)
+        
+        # Un ciclo puede empezar en cualquiera de sus nodos: fijar el de menor
+        # grado como inicio canónico evita repetir la búsqueda desde cada nodo
+        inicio = extremos[0] if ciclo else -1
+        
+        if len(nodos) > LIMITE_DP:
+            return self._backtrack_hamiltoniano(inicio, extremos)
             
+        # Vecinos de cada nodo codificados como máscara de bits
+        origen = np.repeat(np.arange(len(nodos)), np.diff(self._offsets))
+        adj_mask = np.zeros(len(nodos), dtype=np.int64)
+        np.bitwise_or.at(adj_mask, origen, np.left_shift(1, self._vecinos, dtype=np.int64))
+        
+        if NUMBA_DISPONIBLE:
+            camino = _dp_hamiltoniano(adj_mask, len(nodos), inicio)
+            return [nodos[i] for i in camino] if len(camino) else None
+            
+        adj_mask = adj_mask.tolist()
+        completo = (1 << len(nodos)) - 1
+        
+        @functools.lru_cache(maxsize=None)
+        def solve(v, mask):
+            # Camino que visita exactamente los nodos de mask y termina en v
+            if mask == 1 << v:
+                return (v,) if inicio < 0 or v == inicio else None
+            if v == inicio:
+                return None
+            resto = mask & ~(1 << v)
+            m = adj_mask[v] & resto
+            while m:
+                b = m & -m
+                u = b.bit_length() - 1
+                m ^= b
+                camino = solve(u, resto)
+                if camino is not None:
+                    return camino + (v,)
+            return None
+            
+        for v in range(len(nodos)) if ciclo else extremos:
+            if inicio >= 0 and not adj_mask[v] & (1 << inicio):
+                continue
+            camino = solve(v, completo)
+            if camino is not None:
+                return [nodos[i] for i in camino]
+        return None
+        
+    @staticmethod
+    def _extremos_candidatos(grados):
+        """Nodos ordenados por grado ascendente; solo los de grado 1 si existen"""
+        orden = sorted(range(len(grados)), key=grados.__getitem__)
+        if grados[orden[0]] == 1:
+            orden = [v for v in orden if grados[v] == 1]
+        return orden
+        
+    def _camino_voraz(self):
+        """Recorrido voraz hacia el vecino libre con menos vecinos libres"""
+        n = len(self._nodos)
+        vecinos = self._vecinos.tolist()
+        offsets = self._offsets.tolist()
+        visitados = [False] * n
+        
+        def libres(v):
+            return [u for u in vecinos[offsets[v]:offsets[v + 1]] if not visitados[u]]
+            
+        inicio = int(np.argmin(np.diff(self._offsets)))
+        camino = [inicio]
+        visitados[inicio] = True
+        while len(camino) < n:
+            candidatos = libres(camino[-1])
+            if not candidatos:
+                return None
+            siguiente = min(candidatos, key=lambda u: len(libres(u)))
+            camino.append(siguiente)
+            visitados[siguiente] = True
+        return [self._nodos[i] for i in camino]
+        
+    def _backtrack_hamiltoniano(self, inicio_ciclo=-1, extremos=None):
+        """Búsqueda por backtracking para circuitos demasiado grandes para la DP"""
+        n = len(self._nodos)
+        vecinos = self._vecinos.tolist()
+        offsets = self._offsets.tolist()
+        
+        # Máscaras de vecinos como enteros de Python (sin límite de 64 nodos)
+        adj_int = [0] * n
+        for v in range(n):
+            for u in vecinos[offsets[v]:offsets[v + 1]]:
+                adj_int[v] |= 1 << u
+                
         # Probar desde cada nodo como punto de inicio
-        for inicio in nodos:
-            camino = backtrack([inicio], {inicio})
+        ciclo = inicio_ciclo >= 0
+        if ciclo:
+            inicios = [inicio_ciclo]
+        else:
+            inicios = extremos if extremos is not None else list(range(n))
+        
+        # Pasada rápida con presupuesto de pasos: resuelve los casos fáciles sin
+        # arrancar procesos y descarta los inicios que ya quedaron agotados
+        limite = max(1, PASOS_PASADA_RAPIDA // len(inicios))
+        pendientes = []
+        for inicio in inicios:
+            camino = _buscar_desde((adj_int, n, inicio, ciclo, limite))
             if camino:
-                return camino
+                return [self._nodos[i] for i in camino]
+            if camino is False:
+                pendientes.append(inicio)
+                
+        tareas = [(adj_int, n, inicio, ciclo, None) for inicio in pendientes]
+        if PROCESOS_BUSQUEDA > 1 and len(tareas) > 1:
+            # Los inicios son independientes: se reparten entre procesos y se
+            # cancela el resto en cuanto uno encuentra el camino. "spawn" evita
+            # hacer fork de un proceso con Tk e hilos activos
+            contexto = multiprocessing.get_context("spawn")
+            with contexto.Pool(min(PROCESOS_BUSQUEDA, len(tareas))) as pool:
+                for camino in pool.imap_unordered(_buscar_desde, tareas):
+                    if camino:
+                        pool.terminate()
+                        return [self._nodos[i] for i in camino]
+            return None
+            
+        for tarea in tareas:
+            camino = _buscar_desde(tarea)
+            if camino:
+                return [self._nodos[i] for i in camino]
         return None
         
     def encontrar_ciclo_hamiltoniano(self):
         """Encontrar ciclo hamiltoniano si existe"""
-        camino = self.encontrar_camino_hamiltoniano()
-        if not camino:
+        huella = self._sincronizar()
+        if len(self._nodos) < 3:
+            # Circuitos mínimos: basta con cerrar el camino
+            camino = self.encontrar_camino_hamiltoniano()
+            if camino and self.circuito.grafo.has_edge(camino[-1], camino[0]):
+                return camino + [camino[0]]
             return None
             
-        # Verificar si se puede cerrar el ciclo
-        if self.circuito.grafo.has_edge(camino[-1], camino[0]):
-            return camino + [camino[0]]
-        return None
+        if self._cached_cycle is None or self._cached_cycle[0] != huella:
+            # Un ciclo exige al menos dos conexiones por componente
+            if np.diff(self._offsets).min() < 2:
+                ciclo = None
+            else:
+                ciclo = self._buscar_hamiltoniano(ciclo=True)
+            self._cached_cycle = (huella, ciclo)
+            
+        ciclo = self._cached_cycle[1]
+        return ciclo + [ciclo[0]] if ciclo is not None else None
         
     def calcular_eficiencia_energetica(self, camino):
         """Calcular eficiencia energética del camino"""
         if not camino or len(camino) < 2:
             return 0
             
-        resistencia_total = 0
-        for i in range(len(camino) - 1):
-            arista = (camino[i], camino[i+1])
-            if arista in self.circuito.conexiones:
-                resistencia_total += self.circuito.conexiones[arista]
-            elif (arista[1], arista[0]) in self.circuito.conexiones:
-                resistencia_total += self.circuito.conexiones[(arista[1], arista[0])]
-            else:
-                resistencia_total += 1.0  # Resistencia por defecto
+        resistencia_total = self.calcular_resistencia_total(camino)
                 
         # Eficiencia inversamente proporcional a la resistencia
         return 1.0 / (1.0 + resistencia_total)
+        
+    def calcular_resistencia_total(self, camino):
+        """Sumar la resistencia de las conexiones recorridas por el camino"""
+        if not camino or len(camino) < 2:
+            return 0.0
+            
+        self._sincronizar()
+        camino = tuple(camino)
+        if self._cached_resistencia is not None and self._cached_resistencia[0] == camino:
+            return self._cached_resistencia[1]
+            
+        path_idx = np.fromiter((self._idx[x] for x in camino), dtype=np.intp, count=len(camino))
+        resistencia_total = float(self.matriz_resistencias[path_idx[:-1], path_idx[1:]].sum())
+        self._cached_resistencia = (camino, resistencia_total)
+        return resistencia_total
 
 class VisualizadorCircuito:
     """Clase para visualizar circuitos y caminos hamiltonianos"""
@@ -110,6 +597,7 @@ class VisualizadorCircuito:
         self.parent = parent
         self.fig, self.ax = plt.subplots(figsize=(10, 8))
         self.canvas = FigureCanvasTkAgg(self.fig, parent)
+        self._pos_cache = OrderedDict()  # {(nodos, aristas): posiciones}
         
     def dibujar_circuito(self, circuito, camino_hamiltoniano=None):
         """Dibujar el circuito con opción de resaltar camino hamiltoniano"""
@@ -128,7 +616,7 @@ class VisualizadorCircuito:
                 pos[nodo] = circuito.grafo.nodes[nodo]['pos']
         
         if not pos:
-            pos = nx.spring_layout(circuito.grafo, seed=42)
+            pos = self._layout(circuito.grafo)
             
         # Dibujar todas las aristas en gris claro
         nx.draw_networkx_edges(circuito.grafo, pos, edge_color='lightgray', 
@@ -141,22 +629,13 @@ class VisualizadorCircuito:
             nx.draw_networkx_edges(circuito.grafo, pos, edgelist=camino_aristas,
                                  edge_color='red', width=3, ax=self.ax)
         
-        # Dibujar nodos con colores según tipo de componente
-        colores_componentes = {
-            'Resistor': 'lightblue',
-            'Capacitor': 'lightgreen', 
-            'Inductor': 'lightyellow',
-            'Transistor': 'lightcoral',
-            'IC': 'lightpink',
-            'Fuente': 'gold'
-        }
-        
-        for tipo in set(circuito.componentes.values()):
-            nodos_tipo = [n for n, t in circuito.componentes.items() if t == tipo]
-            if nodos_tipo:
-                nx.draw_networkx_nodes(circuito.grafo, pos, nodelist=nodos_tipo,
-                                     node_color=colores_componentes.get(tipo, 'white'),
-                                     node_size=800, ax=self.ax)
+        # Dibujar nodos con colores según tipo de componente: la paleta se
+        # indexa con los códigos de tipo (-1, sin tipo, toma el último color)
+        paleta = np.array([COLORES_COMPONENTES.get(tipo, 'white') for tipo in circuito.tipos]
+                          + ['white'])
+        node_color = paleta[circuito.type_idx].tolist()
+        nx.draw_networkx_nodes(circuito.grafo, pos, nodelist=circuito.node_ids,
+                             node_color=node_color, node_size=800, ax=self.ax)
         
         # Etiquetas de nodos
         nx.draw_networkx_labels(circuito.grafo, pos, font_size=8, ax=self.ax)
@@ -165,6 +644,19 @@ class VisualizadorCircuito:
         self.ax.axis('off')
         self.canvas.draw()
         
+    def _layout(self, grafo):
+        """Posiciones de spring_layout, reutilizadas mientras el grafo no cambie"""
+        clave = (frozenset(grafo.nodes()), frozenset(grafo.edges()))
+        if clave in self._pos_cache:
+            self._pos_cache.move_to_end(clave)
+            return self._pos_cache[clave]
+            
+        pos = nx.spring_layout(grafo, seed=42)
+        self._pos_cache[clave] = pos
+        if len(self._pos_cache) > TAMANO_CACHE_LAYOUT:
+            self._pos_cache.popitem(last=False)
+        return pos
+        
     def get_widget(self):
         return self.canvas.get_tk_widget()
 
@@ -179,6 +671,15 @@ class AplicacionHamiltonianoCircuitos:
         self.circuito_actual = CircuitoElectronico()
         self.analizador = None
         
+        # Redibujado diferido: varias peticiones seguidas se agrupan en una
+        self._redraw_pendiente = False
+        self._camino_pendiente = None
+        
+        # Análisis en un hilo de trabajo para no bloquear la interfaz
+        self._analizando = False
+        self._spinner_paso = 0
+        self._spinner_after = None
+        
         self.setup_ui()
         self.crear_circuito_ejemplo()
         
@@ -203,13 +704,16 @@ class AplicacionHamiltonianoCircuitos:
         self.id_entry.pack(fill=tk.X, padx=5, pady=2)
         
         ttk.Label(comp_frame, text="Tipo:").pack(anchor=tk.W)
-        self.tipo_combo = ttk.Combobox(comp_frame, values=[
-            "Resistor", "Capacitor", "Inductor", "Transistor", "IC", "Fuente"
-        ])
+        self.tipo_combo = ttk.Combobox(comp_frame, values=list(TIPOS_COMPONENTE))
         self.tipo_combo.pack(fill=tk.X, padx=5, pady=2)
         
-        ttk.Button(comp_frame, text="Agregar Componente", 
-                  command=self.agregar_componente).pack(pady=5)
+        # Botones que modifican el circuito: se bloquean durante un análisis
+        self.botones_edicion = []
+        
+        boton = ttk.Button(comp_frame, text="Agregar Componente", 
+                          command=self.agregar_componente)
+        boton.pack(pady=5)
+        self.botones_edicion.append(boton)
         
         # Sección de conexiones
         conn_frame = ttk.LabelFrame(control_frame, text="Gestión de Conexiones")
@@ -228,31 +732,39 @@ class AplicacionHamiltonianoCircuitos:
         self.resistencia_entry.insert(0, "1.0")
         self.resistencia_entry.pack(fill=tk.X, padx=5, pady=2)
         
-        ttk.Button(conn_frame, text="Agregar Conexión", 
-                  command=self.agregar_conexion).pack(pady=5)
+        boton = ttk.Button(conn_frame, text="Agregar Conexión", 
+                          command=self.agregar_conexion)
+        boton.pack(pady=5)
+        self.botones_edicion.append(boton)
         
         # Sección de análisis
         analisis_frame = ttk.LabelFrame(control_frame, text="Análisis Hamiltoniano")
         analisis_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(analisis_frame, text="Encontrar Camino Hamiltoniano", 
-                  command=self.analizar_hamiltoniano).pack(fill=tk.X, pady=2)
-        
-        ttk.Button(analisis_frame, text="Encontrar Ciclo Hamiltoniano", 
-                  command=self.analizar_ciclo_hamiltoniano).pack(fill=tk.X, pady=2)
-        
-        ttk.Button(analisis_frame, text="Calcular Eficiencia Energética", 
-                  command=self.calcular_eficiencia).pack(fill=tk.X, pady=2)
+        self.botones_analisis = [
+            ttk.Button(analisis_frame, text="Encontrar Camino Hamiltoniano", 
+                      command=self.analizar_hamiltoniano),
+            ttk.Button(analisis_frame, text="Encontrar Ciclo Hamiltoniano", 
+                      command=self.analizar_ciclo_hamiltoniano),
+            ttk.Button(analisis_frame, text="Calcular Eficiencia Energética", 
+                      command=self.calcular_eficiencia),
+        ]
+        for boton in self.botones_analisis:
+            boton.pack(fill=tk.X, pady=2)
+            
+        # Indicador de análisis en curso
+        self.spinner_label = ttk.Label(analisis_frame, text="")
+        self.spinner_label.pack(anchor=tk.W, padx=5)
         
         # Botones de archivo
         archivo_frame = ttk.LabelFrame(control_frame, text="Archivo")
         archivo_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(archivo_frame, text="Nuevo Circuito", 
-                  command=self.nuevo_circuito).pack(fill=tk.X, pady=2)
-        
-        ttk.Button(archivo_frame, text="Cargar Ejemplo", 
-                  command=self.crear_circuito_ejemplo).pack(fill=tk.X, pady=2)
+        for texto, comando in (("Nuevo Circuito", self.nuevo_circuito),
+                               ("Cargar Ejemplo", self.crear_circuito_ejemplo)):
+            boton = ttk.Button(archivo_frame, text=texto, command=comando)
+            boton.pack(fill=tk.X, pady=2)
+            self.botones_edicion.append(boton)
         
         # Panel derecho - Visualización y resultados
         right_frame = ttk.Frame(main_frame)
@@ -283,8 +795,9 @@ class AplicacionHamiltonianoCircuitos:
             messagebox.showerror("Error", "Debe especificar ID y tipo del componente")
             return
             
-        if id_comp in self.circuito_actual.componentes:
-            messagebox.showerror("Error", f"El componente {id_comp} ya existe")
+        if self.circuito_actual.tiene_componente(id_comp):
+            tipo_existente = self.circuito_actual.tipo_componente(id_comp)
+            messagebox.showerror("Error", f"El componente {id_comp} ya existe ({tipo_existente})")
             return
             
         self.circuito_actual.agregar_componente(id_comp, tipo)
@@ -310,7 +823,7 @@ class AplicacionHamiltonianoCircuitos:
             messagebox.showerror("Error", "Debe especificar ambos componentes")
             return
             
-        if comp1 not in self.circuito_actual.componentes or comp2 not in self.circuito_actual.componentes:
+        if not self.circuito_actual.tiene_componente(comp1) or not self.circuito_actual.tiene_componente(comp2):
             messagebox.showerror("Error", "Ambos componentes deben existir en el circuito")
             return
             
@@ -334,12 +847,14 @@ class AplicacionHamiltonianoCircuitos:
             messagebox.showwarning("Advertencia", "El circuito debe tener al menos 2 componentes")
             return
             
-        self.analizador = AnalizadorHamiltoniano(self.circuito_actual)
+        if not self.analizador:
+            self.analizador = AnalizadorHamiltoniano(self.circuito_actual)
         
-        inicio = time.time()
-        camino = self.analizador.encontrar_camino_hamiltoniano()
-        tiempo_calculo = time.time() - inicio
+        self._iniciar_analisis(self.analizador.encontrar_camino_hamiltoniano,
+                               self._mostrar_camino)
         
+    def _mostrar_camino(self, camino, tiempo_calculo):
+        """Mostrar el resultado de la búsqueda de camino hamiltoniano"""
         if camino:
             self.mostrar_resultado(f"✓ CAMINO HAMILTONIANO ENCONTRADO")
             self.mostrar_resultado(f"Camino: {' → '.join(camino)}")
@@ -351,7 +866,7 @@ class AplicacionHamiltonianoCircuitos:
             self.mostrar_resultado(f"Eficiencia energética: {eficiencia:.4f}")
             
             # Visualizar con camino resaltado
-            self.visualizador.dibujar_circuito(self.circuito_actual, camino)
+            self._schedule_redraw(camino)
         else:
             self.mostrar_resultado("✗ NO EXISTE CAMINO HAMILTONIANO")
             self.mostrar_resultado("El circuito no puede ser recorrido visitando cada componente exactamente una vez")
@@ -365,12 +880,14 @@ class AplicacionHamiltonianoCircuitos:
             messagebox.showwarning("Advertencia", "El circuito debe tener al menos 3 componentes para un ciclo")
             return
             
-        self.analizador = AnalizadorHamiltoniano(self.circuito_actual)
+        if not self.analizador:
+            self.analizador = AnalizadorHamiltoniano(self.circuito_actual)
         
-        inicio = time.time()
-        ciclo = self.analizador.encontrar_ciclo_hamiltoniano()
-        tiempo_calculo = time.time() - inicio
+        self._iniciar_analisis(self.analizador.encontrar_ciclo_hamiltoniano,
+                               self._mostrar_ciclo)
         
+    def _mostrar_ciclo(self, ciclo, tiempo_calculo):
+        """Mostrar el resultado de la búsqueda de ciclo hamiltoniano"""
         if ciclo:
             self.mostrar_resultado(f"✓ CICLO HAMILTONIANO ENCONTRADO")
             self.mostrar_resultado(f"Ciclo: {' → '.join(ciclo)}")
@@ -382,34 +899,90 @@ class AplicacionHamiltonianoCircuitos:
             self.mostrar_resultado(f"Eficiencia energética: {eficiencia:.4f}")
             
             # Visualizar con ciclo resaltado
-            self.visualizador.dibujar_circuito(self.circuito_actual, ciclo)
+            self._schedule_redraw(ciclo)
         else:
             self.mostrar_resultado("✗ NO EXISTE CICLO HAMILTONIANO")
             self.mostrar_resultado("El circuito no puede formar un ciclo visitando cada componente exactamente una vez")
             self.actualizar_visualizacion()
             
+    def _iniciar_analisis(self, buscar, mostrar):
+        """Ejecutar buscar() en un hilo de trabajo y pasar el resultado a mostrar()"""
+        self._analizando = True
+        # El hilo lee el grafo: nada puede modificar el circuito mientras tanto
+        for boton in self.botones_analisis + self.botones_edicion:
+            boton.state(['disabled'])
+        self._animar_spinner()
+        
+        # Las estructuras del analizador se construyen aquí, en el hilo de Tk,
+        # y su huella identifica el circuito analizado
+        huella = self.analizador.huella()
+        hilo = threading.Thread(target=self._run_analysis,
+                                args=(huella, buscar, mostrar), daemon=True)
+        hilo.start()
+        
+    def _run_analysis(self, huella, buscar, mostrar):
+        """Cuerpo del hilo de trabajo: no toca widgets, devuelve todo vía root.after"""
+        inicio = time.time()
+        try:
+            resultado = buscar()
+        except Exception as error:
+            self.root.after(0, self._analysis_error, error)
+            return
+        tiempo_calculo = time.time() - inicio
+        self.root.after(0, self._display_result, huella, mostrar, resultado, tiempo_calculo)
+        
+    def _finalizar_analisis(self):
+        """Restaurar los controles de análisis"""
+        self._analizando = False
+        if self._spinner_after is not None:
+            self.root.after_cancel(self._spinner_after)
+            self._spinner_after = None
+        self.spinner_label.config(text="")
+        for boton in self.botones_analisis + self.botones_edicion:
+            boton.state(['!disabled'])
+            
+    def _display_result(self, huella, mostrar, resultado, tiempo_calculo):
+        """Mostrar en el hilo principal el resultado del análisis"""
+        self._finalizar_analisis()
+        # Si el circuito cambió durante la búsqueda, el resultado ya no aplica
+        if self.analizador is None or self.analizador.huella() != huella:
+            self.mostrar_resultado("El circuito cambió durante el análisis; repita la búsqueda")
+            return
+        mostrar(resultado, tiempo_calculo)
+        
+    def _analysis_error(self, error):
+        """Informar de un error ocurrido en el hilo de trabajo"""
+        self._finalizar_analisis()
+        messagebox.showerror("Error", f"Error durante el análisis: {error}")
+        
+    def _animar_spinner(self):
+        """Animar el indicador mientras el análisis está en curso"""
+        if not self._analizando:
+            return
+        marcos = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+        self.spinner_label.config(text=f"{marcos[self._spinner_paso % len(marcos)]} Analizando...")
+        self._spinner_paso += 1
+        self._spinner_after = self.root.after(100, self._animar_spinner)
+        
     def calcular_eficiencia(self):
         """Calcular y mostrar análisis de eficiencia energética"""
         if not self.analizador:
             self.analizador = AnalizadorHamiltoniano(self.circuito_actual)
             
-        camino = self.analizador.encontrar_camino_hamiltoniano()
+        # Sin camino en caché la búsqueda es exponencial: también va al hilo de trabajo
+        self._iniciar_analisis(self.analizador.encontrar_camino_hamiltoniano,
+                               self._mostrar_eficiencia)
+        
+    def _mostrar_eficiencia(self, camino, tiempo_calculo):
+        """Mostrar el análisis de eficiencia energética del camino hamiltoniano"""
         if not camino:
-            messagebox.showinfo("Información", "Primero debe encontrar un camino hamiltoniano")
+            messagebox.showinfo("Información", "No existe un camino hamiltoniano sobre el que calcular la eficiencia")
             return
             
         eficiencia = self.analizador.calcular_eficiencia_energetica(camino)
         
         # Calcular resistencia total
-        resistencia_total = 0
-        for i in range(len(camino) - 1):
-            arista = (camino[i], camino[i+1])
-            if arista in self.circuito_actual.conexiones:
-                resistencia_total += self.circuito_actual.conexiones[arista]
-            elif (arista[1], arista[0]) in self.circuito_actual.conexiones:
-                resistencia_total += self.circuito_actual.conexiones[(arista[1], arista[0])]
-            else:
-                resistencia_total += 1.0
+        resistencia_total = self.analizador.calcular_resistencia_total(camino)
                 
         self.mostrar_resultado("=== ANÁLISIS DE EFICIENCIA ENERGÉTICA ===")
         self.mostrar_resultado(f"Resistencia total del camino: {resistencia_total:.2f} Ω")
@@ -426,25 +999,30 @@ class AplicacionHamiltonianoCircuitos:
     def analizar_propiedades_circuito(self):
         """Analizar propiedades del circuito"""
         grafo = self.circuito_actual.grafo
+        estadisticas = self.circuito_actual.obtener_estadisticas()
         
         self.mostrar_resultado("\n=== PROPIEDADES DEL CIRCUITO ===")
         self.mostrar_resultado(f"Número de componentes: {len(grafo.nodes())}")
         self.mostrar_resultado(f"Número de conexiones: {len(grafo.edges())}")
-        self.mostrar_resultado(f"Densidad del grafo: {nx.density(grafo):.3f}")
+        self.mostrar_resultado(f"Densidad del grafo: {estadisticas['densidad']:.3f}")
         
         if len(grafo.nodes()) > 0:
-            conectado = nx.is_connected(grafo)
+            conectado = estadisticas['conectado']
             self.mostrar_resultado(f"Circuito conectado: {'Sí' if conectado else 'No'}")
             
             if conectado:
-                diametro = nx.diameter(grafo)
-                self.mostrar_resultado(f"Diámetro del circuito: {diametro}")
+                # nx.diameter hace BFS desde todos los nodos; en circuitos
+                # grandes basta la cota de 2 barridos BFS, O(n+m)
+                if grafo.number_of_nodes() <= LIMITE_DIAMETRO_EXACTO:
+                    diametro = nx.diameter(grafo)
+                    self.mostrar_resultado(f"Diámetro del circuito: {diametro}")
+                else:
+                    diametro = nx.approximation.diameter(grafo, seed=42)
+                    self.mostrar_resultado(f"Diámetro del circuito (aprox.): {diametro}")
                 
         # Análisis de grados
-        grados = dict(grafo.degree())
-        if grados:
-            grado_promedio = sum(grados.values()) / len(grados)
-            self.mostrar_resultado(f"Grado promedio: {grado_promedio:.2f}")
+        if estadisticas['grados']:
+            self.mostrar_resultado(f"Grado promedio: {estadisticas['grado_promedio']:.2f}")
             
     def crear_circuito_ejemplo(self):
         """Crear un circuito de ejemplo"""
@@ -481,7 +1059,19 @@ class AplicacionHamiltonianoCircuitos:
         
     def actualizar_visualizacion(self):
         """Actualizar la visualización del circuito"""
-        self.visualizador.dibujar_circuito(self.circuito_actual)
+        self._schedule_redraw()
+        
+    def _schedule_redraw(self, camino=None):
+        """Programar un redibujado para cuando Tk esté ocioso; prevalece la última petición"""
+        self._camino_pendiente = camino
+        if not self._redraw_pendiente:
+            self._redraw_pendiente = True
+            self.root.after_idle(self._do_redraw)
+            
+    def _do_redraw(self):
+        """Dibujar una sola vez el estado pendiente del circuito"""
+        self._redraw_pendiente = False
+        self.visualizador.dibujar_circuito(self.circuito_actual, self._camino_pendiente)
         
     def mostrar_resultado(self, texto):
         """Mostrar resultado en el área de texto"""
@@ -494,6 +1084,8 @@ class AplicacionHamiltonianoCircuitos:
 
 def main():
     """Función principal para ejecutar la aplicación"""
+    # Necesario para que los procesos de búsqueda arranquen en el ejecutable
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = AplicacionHamiltonianoCircuitos(root)
     